@@ -1,13 +1,25 @@
 # -*- coding: utf-8 -*-
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable, Optional
 from datetime import datetime
+import json
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .emoji import Emoji
 from .types import SecretStr
 
 
+MAX_MESSAGE_CHARS = 2000
+_SEPARATOR = "━" * 40
+_JSON_HEADERS = {"Content-Type": "application/json"}
+MAX_RATE_LIMIT_WAIT_SEC = 5.0
+
+
+@lru_cache(maxsize=1024)
 def _format_date(iso_date_str: Optional[str]) -> str:
     if not iso_date_str:
         return ""
@@ -20,6 +32,59 @@ def _format_date(iso_date_str: Optional[str]) -> str:
         return iso_date_str
 
 
+def _rate_limit_wait(headers) -> float:
+    """
+    Get how long to wait before the next webhook call.
+
+    Args:
+        headers: Response headers from Discord.
+
+    Returns:
+        float: Seconds to wait, 0.0 while the rate limit bucket has room.
+    """
+    if headers.get("X-RateLimit-Remaining") != "0":
+        return 0.0
+    try:
+        reset_after = float(headers.get("X-RateLimit-Reset-After", 0))
+    except ValueError:
+        return 0.0
+    return min(max(reset_after, 0.0), MAX_RATE_LIMIT_WAIT_SEC)
+
+
+def _batch_messages(
+    messages: list[str],
+    max_chars: int = MAX_MESSAGE_CHARS
+) -> list[str]:
+    """
+    Pack messages into as few Discord messages as possible.
+
+    Messages are joined with newlines while the combined length stays
+    within max_chars. A single message longer than max_chars is kept as is.
+
+    Args:
+        messages: Messages to pack, in order.
+        max_chars: Maximum characters per Discord message.
+
+    Returns:
+        list[str]: Packed messages.
+    """
+    batches: list[str] = []
+    current: list[str] = []
+    current_len = 0
+    for msg in messages:
+        added_len = len(msg) + (1 if current else 0)
+        if current and current_len + added_len > max_chars:
+            batches.append("\n".join(current))
+            current = []
+            current_len = 0
+            added_len = len(msg)
+        current.append(msg)
+        current_len += added_len
+    if current:
+        batches.append("\n".join(current))
+    return batches
+
+
 @dataclass(frozen=True)
 class Event:
     title: str
@@ -28,6 +93,39 @@ class Event:
     date: Optional[str] = None
     diff_preview: Optional[str] = None
     is_initial: bool = False
+    page_key: Optional[str] = None
+
+
+def _format_event(item: Event, header: Optional[str] = None) -> str:
+    """
+    Format an event as a Discord message block.
+
+    Args:
+        item: The event to format.
+        header: Optional header placed before the event.
+
+    Returns:
+        str: The formatted message block.
+    """
+    msg_parts = []
+
+    if header:
+        msg_parts.append(header)
+
+    msg_parts.append(f"**{item.title}**")
+
+    if item.date and not item.is_initial:
+        formatted_date = _format_date(item.date)
+        msg_parts.append(f"{Emoji.date} {formatted_date}")
+
+    msg_parts.append(f"{Emoji.link} <{item.url}>")
+
+    if item.diff_preview and not item.is_initial:
+        msg_parts.append(f"{Emoji.contents} {item.diff_preview} ...")
+
+    msg_parts.append(_SEPARATOR)
+
+    return "\n".join(msg_parts)
 
 
 class WebhookClient:
@@ -41,62 +139,96 @@ class WebhookClient:
     def __init__(self, webhook_url: SecretStr, timeout_sec: int = 10):
         self._url = webhook_url
         self._timeout = timeout_sec
+        self._session = requests.Session()
+        # Earliest time.monotonic() at which the next message may be posted.
+        self._next_post_at = 0.0
+
+        # Webhook POSTs are not idempotent: after a 5xx or a read error
+        # Discord may already have created the message, so only retry
+        # 429s and connections that never reached the server.
+        retries = Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.2,
+            status_forcelist=(429,),
+            allowed_methods=("POST",),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retries,
+                              pool_connections=1,
+                              pool_maxsize=1
+                              )
+        self._session.mount("https://", adapter)
+
+    def __enter__(self) -> "WebhookClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self._session.close()
 
     def send_events(
         self,
         events: Iterable[Event],
         header: Optional[str] = None
     ) -> list:
-        """Send events to Discord as separate messages per page.
+        """Send events to Discord, packing several pages per message.
 
         Args:
             events: Iterable of events to send.
-            header: Optional header to add to each message.
+            header: Optional header to add to the first message.
 
         Returns:
             list: List of responses from Discord API.
         """
-        items = list(events)
-        if not items:
-            return []
-
-        responses = []
-
-        for item in items:
-            msg_parts = []
-
-            if header and item == items[0]:
-                msg_parts.append(header)
+        messages = [
+            _format_event(item, header if i == 0 else None)
+            for i, item in enumerate(events)
+        ]
 
-            msg_parts.append(f"**{item.title}**")
-
-            if item.date and not item.is_initial:
-                formatted_date = _format_date(item.date)
-                msg_parts.append(f"{Emoji.date} {formatted_date}")
-
-            msg_parts.append(f"{Emoji.link} <{item.url}>")
-
-            if item.diff_preview and not item.is_initial:
-                msg_parts.append(f"{Emoji.contents} {item.diff_preview} ...")
-
-            msg_parts.append("━" * 40)
-
-            msg = "\n".join(msg_parts)
+        if not messages:
+            return []
 
-            payload = {
-                "content": msg,
-                "allowed_mentions": {"parse": []},
-            }
+        # Post one batch at a time so Discord shows them in event order.
+        return [self._post_message(msg) for msg in _batch_messages(messages)]
 
-            resp = requests.post(
-                self._url, json=payload, timeout=self._timeout
-            )
-            resp.raise_for_status()
+    def _post_message(self, msg: str) -> dict:
+        """
+        Post a single message to Discord.
 
-            # Discord API may return 204 No Content
-            try:
-                responses.append(resp.json())
-            except requests.exceptions.JSONDecodeError:
-                responses.append({"status": "ok"})
+        Args:
+            msg: The message content.
 
-        return responses
+        Returns:
+            dict: Response from Discord API.
+        """
+        payload = {
+            "content": msg,
+            "allowed_mentions": {"parse": []},
+        }
+
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        # Wait out a bucket the previous message exhausted, instead of
+        # running into 429s; retries honour Retry-After if one slips
+        # through. Waiting here rather than after posting means the last
+        # message of a run never sleeps.
+        delay = self._next_post_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        resp = self._session.post(
+            self._url, data=body, headers=_JSON_HEADERS,
+            timeout=self._timeout
+        )
+        resp.raise_for_status()
+        self._next_post_at = time.monotonic() + _rate_limit_wait(resp.headers)
+
+        # Discord API may return 204 No Content
+        try:
+            return resp.json()
+        except requests.exceptions.JSONDecodeError:
+            return {"status": "ok"}
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """
+    Write bytes to a file atomically.
+
+    The data is written to a temporary file next to the target, flushed to
+    disk and then renamed over the target, so a crash mid-write never
+    leaves a truncated file behind.
+
+    Args:
+        path: The path to the file.
+        data: The bytes to write.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def atomic_write_json(path: Path, data: Any, **dump_kwargs: Any):
+    """
+    Write JSON to a file atomically.
+
+    The data is streamed to a temporary file next to the target, so the
+    serialized document is never held in memory as a whole. The file is
+    then flushed to disk and renamed over the target, so a crash mid-write
+    never leaves a truncated file behind.
+
+    Args:
+        path: The path to the file.
+        data: The JSON-serializable data to write.
+        **dump_kwargs: Extra keyword arguments passed to json.dump.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        json.dump(data, f, ensure_ascii=False, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
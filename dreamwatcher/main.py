@@ -4,7 +4,7 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
-from .watcher import Config, run
+from .watcher import Config, MAX_WORKERS, PAGE_FETCH_TIMEOUT_SEC, run
 from .types import SecretStr
 
 
@@ -50,6 +50,10 @@ def main():
         name.strip() for name in page_names_str.split(",")
         if name.strip()
     ]
+    max_workers_str = os.environ.get("WIKIWIKI_MAX_WORKERS", "").strip()
+    page_fetch_timeout_str = os.environ.get(
+        "WIKIWIKI_PAGE_FETCH_TIMEOUT_SEC", ""
+    ).strip()
     rss_urls = [
         url.strip() for url in rss_urls_str.split(",")
         if url.strip()
@@ -71,6 +75,21 @@ def main():
     if not webhook_url:
         print("Error: DISCORD_WEBHOOK_URL is not set")
         return 2
+    try:
+        max_workers = int(max_workers_str) if max_workers_str else MAX_WORKERS
+        page_fetch_timeout_sec = (
+            float(page_fetch_timeout_str) if page_fetch_timeout_str
+            else PAGE_FETCH_TIMEOUT_SEC
+        )
+    except ValueError as e:
+        print(f"Error: invalid concurrency setting: {e}")
+        return 2
+    if max_workers < 1:
+        print("Error: WIKIWIKI_MAX_WORKERS must be at least 1")
+        return 2
+    if page_fetch_timeout_sec <= 0:
+        print("Error: WIKIWIKI_PAGE_FETCH_TIMEOUT_SEC must be positive")
+        return 2
 
     cfg = Config(
         wiki_id=wiki_id,
@@ -84,7 +103,9 @@ def main():
         snapshots_dir=Path(snapshots_dir),
         monitor_recent_created=monitor_recent_created,
         auto_track_patterns=auto_track_patterns,
-        diff_full_pages=diff_full_pages
+        diff_full_pages=diff_full_pages,
+        max_workers=max_workers,
+        page_fetch_timeout_sec=page_fetch_timeout_sec
         )
 
     return run(cfg)
@@ -2,14 +2,38 @@
 import json
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, Optional
+from bisect import bisect_left, bisect_right
+from itertools import starmap
 import difflib
 
-EDIT_SIMILARITY_THRESHOLD = 0.9
+from .files import atomic_write_bytes
+
 
+EDIT_SIMILARITY_THRESHOLD = 0.9
 
-@dataclass(frozen=True)
+_LIST_MARKER_RE = re.compile(r"^\s*(-\s*)+")
+_COLOR_BLOCK_RE = re.compile(r"&color\([^)]*\)\{([^}]*)\};?")
+_COLOR_RE = re.compile(r"&color\([^)]*\)")
+_SIZE_BLOCK_RE = re.compile(r"&size\([^)]*\)\{([^}]*)\};?")
+_SIZE_RE = re.compile(r"&size\([^)]*\)")
+_INLINE_PLUGIN_RE = re.compile(r"&\w+([^;]*);")
+_STRIKE_RE = re.compile(r"%%([^%]*)%%")
+_UNDERLINE_RE = re.compile(r"%%%([^%]*)%%%")
+_BRACES_RE = re.compile(r"\{([^}]*)\}")
+_ANCHOR_RE = re.compile(r"\s*\[#[^\]]+\]")
+_HEADING_RE = re.compile(r"^\*+\s*")
+_SKIPPED_LINE_PREFIXES = ("//", "|", "#", "&")
+_DASH_ONLY_RE = re.compile(r"[\s\-–—−‐‑‒―⁃⁻₋﹘﹣－]*")
+_WIKI_ALIAS_LINK_RE = re.compile(r"\[\[([^\]]+)>([^\]]+)\]\]")
+_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\([^\)]+\)")
+_MD_LINK_SPLIT_RE = re.compile(r"(\[[^\]]+\]\([^\)]+\))")
+_URL_RE = re.compile(r"https?://[^\s]+")
+
+
+@dataclass(frozen=True, slots=True)
 class PageSnapshot:
     """Snapshot of page content."""
     page_name: str
@@ -29,55 +53,54 @@ def _normalize_diff_line(content: str) -> Optional[str]:
         Optional[str]: Normalized content of diff line, or None.
     """
     # Skip empty lines
-    if not content.strip():
-        return None
-    # Strip list markers
-    content = re.sub(r"^\s*(-\s*)+", "", content)
-    # Skip comment lines
-    if content.lstrip().startswith("//"):
+    if not content or content.isspace():
         return None
-    # Skip plug-in content lines
-    if content.lstrip().startswith("|"):
-        return None
-    # Drop common no-content macros
-    if content.strip() in {"#br", "#br;"}:
-        return None
-    # Skip lines starting with #
-    if content.lstrip().startswith("#"):
-        return None
-    # Skip lines starting with & (inline plugin/macro)
-    if content.lstrip().startswith("&"):
+    stripped = content.lstrip()
+    if stripped.startswith("-"):
+        # Strip list markers; the match also eats the whitespace around
+        # them, so what is left has no leading whitespace.
+        content = _LIST_MARKER_RE.sub("", content)
+        stripped = content
+    # Skip comment lines (//), plug-in content lines (|), lines starting
+    # with # (including #br) and inline plugin/macro lines (&)
+    if stripped.startswith(_SKIPPED_LINE_PREFIXES):
         return None
 
     # Convert wiki emphasis markers
     filtered = content.replace("''", "")
-    # color
-    filtered = re.sub(r"&color\([^)]*\)\{([^}]*)\};?", r"\1", filtered)
-    filtered = re.sub(r"&color\([^)]*\)", "", filtered)
-    # size
-    filtered = re.sub(r"&size\([^)]*\)\{([^}]*)\};?", r"\1", filtered)
-    filtered = re.sub(r"&size\([^)]*\)", "", filtered)
-    # date
-    filtered = re.sub(r"&\w+([^;]*);", r"\1", filtered)
-    # strikethrough convert
-    filtered = re.sub(r"%%([^%]*)%%", r"~~\1~~", filtered)
-    # underline convert
-    filtered = re.sub(r"%%%([^%]*)%%%", r"__\1__", filtered)
-    # braces
-    filtered = re.sub(r"\{([^}]*)\}", r"\1", filtered)
-    # anchors
-    filtered = re.sub(r"\s*\[#[^\]]+\]", "", filtered)
-    # &br() and &br;
-    filtered = re.sub(r"&br\(\)", "", filtered)
-    filtered = re.sub(r"&br;", "", filtered)
-    # leading '*'
-    filtered = re.sub(r"^\*+\s*", "", filtered)
+    # Each group below only runs when its trigger character is present;
+    # no pass introduces '&', '%', '{' or '[', so plain text lines skip
+    # the regex engine entirely.
+    if "&" in filtered:
+        # color
+        filtered = _COLOR_BLOCK_RE.sub(r"\1", filtered)
+        filtered = _COLOR_RE.sub("", filtered)
+        # size
+        filtered = _SIZE_BLOCK_RE.sub(r"\1", filtered)
+        filtered = _SIZE_RE.sub("", filtered)
+        # date
+        filtered = _INLINE_PLUGIN_RE.sub(r"\1", filtered)
+    if "%%" in filtered:
+        # strikethrough convert
+        filtered = _STRIKE_RE.sub(r"~~\1~~", filtered)
+        # underline convert
+        filtered = _UNDERLINE_RE.sub(r"__\1__", filtered)
+    if "{" in filtered:
+        # braces
+        filtered = _BRACES_RE.sub(r"\1", filtered)
+    if "[#" in filtered:
+        # anchors
+        filtered = _ANCHOR_RE.sub("", filtered)
+    if "&br" in filtered:
+        # &br() and &br;
+        filtered = filtered.replace("&br()", "").replace("&br;", "")
+    if filtered.startswith("*"):
+        # leading '*'
+        filtered = _HEADING_RE.sub("", filtered)
     # cleanup
     filtered = filtered.strip()
     # unicodedash only line is not a content
-    if not filtered or re.fullmatch(
-        r"[\s\-–—−‐‑‒―⁃⁻₋﹘﹣－]*", filtered
-    ):
+    if not filtered or _DASH_ONLY_RE.fullmatch(filtered):
         return None
     return filtered
 
@@ -97,22 +120,20 @@ def _parse_diff(
     removed: list[str] = []
     added: list[str] = []
     for line in diff_lines:
-        # Skip header lines
-        if line.startswith("+++"):
-            continue
-        if line.startswith("---"):
+        # Lines come from splitting on "\n", so they carry no line end.
+        marker = line[:1]
+        if marker == "-":
+            target = removed
+        elif marker == "+":
+            target = added
+        else:
             continue
-        if line.startswith("-"):
-            content = line[1:].rstrip("\n")
-            normalized = _normalize_diff_line(content)
-            if normalized is not None:
-                removed.append(normalized)
+        # Skip header lines
+        if line.startswith(("---", "+++")):
             continue
-        if line.startswith("+"):
-            content = line[1:].rstrip("\n")
-            normalized = _normalize_diff_line(content)
-            if normalized is not None:
-                added.append(normalized)
+        normalized = _normalize_diff_line(line[1:])
+        if normalized is not None:
+            target.append(normalized)
     return removed, added
 
 
@@ -123,12 +144,28 @@ def _sequence_match(
 ) -> list[str]:
     if not removed_lines:
         return list(added_lines)
+    # ratio() can never exceed 2 * min(la, lr) / (la + lr), so only removed
+    # lines of similar length are candidates. The window is widened by one
+    # to absorb float rounding; real_quick_ratio() applies the exact bound.
+    removed_by_len = sorted(removed_lines, key=len)
+    removed_lens = [len(line) for line in removed_by_len]
+    matcher = difflib.SequenceMatcher(None)
     result: list[str] = []
     for added in added_lines:
+        added_len = len(added)
+        lo = bisect_left(
+            removed_lens, added_len * threshold / (2 - threshold) - 1
+        )
+        hi = bisect_right(
+            removed_lens, added_len * (2 - threshold) / threshold + 1
+        )
+        matcher.set_seq1(added)
         is_edit = False
-        for removed in removed_lines:
-            ratio = difflib.SequenceMatcher(None, added, removed).ratio()
-            if ratio >= threshold:
+        for removed in removed_by_len[lo:hi]:
+            matcher.set_seq2(removed)
+            if (matcher.real_quick_ratio() >= threshold
+                    and matcher.quick_ratio() >= threshold
+                    and matcher.ratio() >= threshold):
                 is_edit = True
                 break
         if not is_edit:
@@ -146,23 +183,43 @@ def _convert_links(text: str) -> str:
     Returns:
         str: Text with URLs removed
     """
-    text = re.sub(r"\[\[([^\]]+)>([^\]]+)\]\]", r"\1", text)
-    text = re.sub(r"\[([^\]]+)\]\([^\)]+\)", r"\1", text)
-    text = re.sub(r"https?://[^\s]+", "", text)
+    text = _WIKI_ALIAS_LINK_RE.sub(r"\1", text)
+    text = _MD_LINK_RE.sub(r"\1", text)
+    text = _URL_RE.sub("", text)
     return text
 
 
 def _get_display_width(text: str) -> int:
     """
     Get display width of text.
+
+    ASCII characters count as 1 and everything else as 2. The non-ASCII
+    count is taken from an ASCII encode that drops them, which runs in C.
+    """
+    if text.isascii():
+        return len(text)
+    return 2 * len(text) - len(text.encode("ascii", "ignore"))
+
+
+def _truncate_to_width(text: str, max_width: int) -> str:
     """
+    Truncate text to a display width.
+
+    Args:
+        text: Text to truncate.
+        max_width: Maximum display width.
+
+    Returns:
+        str: Longest prefix of text that fits in max_width.
+    """
+    if text.isascii():
+        return text[:max(max_width, 0)]
     width = 0
-    for char in text:
-        if ord(char) > 127:
-            width += 2
-        else:
-            width += 1
-    return width
+    for i, char in enumerate(text):
+        width += 2 if ord(char) > 127 else 1
+        if width > max_width:
+            return text[:i]
+    return text
 
 
 def get_content_diff_preview(
@@ -200,26 +257,18 @@ def get_content_diff_preview(
 
     diff_text = _convert_links(display_diff)
     first_line = diff_text.split("\n")[0]
-    parts = re.split(r"(\[[^\]]+\]\([^\)]+\))", first_line)
+    parts = _MD_LINK_SPLIT_RE.split(first_line)
     result = []
     char_count = 0
     for part in parts:
-        if re.match(r"^\[[^\]]+\]\([^\)]+\)$", part):
+        if _MD_LINK_RE.fullmatch(part):
             result.append(part)
         else:
             if char_count < max_chars:
                 remaining = max_chars - char_count
                 part_width = _get_display_width(part)
                 if part_width > remaining:
-                    truncated = ""
-                    current_width = 0
-                    for char in part:
-                        char_width = (2 if ord(char) > 127 else 1)
-                        if (current_width + char_width > remaining):
-                            break
-                        truncated += char
-                        current_width += char_width
-                    result.append(truncated)
+                    result.append(_truncate_to_width(part, remaining))
                     char_count = max_chars
                 else:
                     result.append(part)
@@ -243,13 +292,18 @@ def get_raw_diff(previous_content, current_content):
     """
     if not previous_content:
         return None
+    if previous_content == current_content:
+        return None
 
     previous_lines = previous_content.splitlines()
     current_lines = current_content.splitlines()
 
+    # Consumers only read the +/- lines, so context lines are left out;
+    # that keeps hunks small and shrinks the stored diff.
     diff = difflib.unified_diff(
         previous_lines,
         current_lines,
+        n=0,
         lineterm=""
     )
 
@@ -257,6 +311,7 @@ def get_raw_diff(previous_content, current_content):
     return "\n".join(diff_lines) if diff_lines else None
 
 
+@lru_cache(maxsize=512)
 def get_display_diff(
     raw_diff: Optional[str],
     apply_sequence_match: bool = True,
@@ -264,6 +319,9 @@ def get_display_diff(
     """
     Get display diff from raw diff.
 
+    Results are cached per raw diff so a diff that is rendered more than
+    once is only filtered and matched once.
+
     Args:
         raw_diff: Raw diff string.
         apply_sequence_match: If True, treat added lines similar to removed
@@ -293,6 +351,9 @@ def load_snapshots(path: Path) -> dict[str, PageSnapshot]:
     """
     Load page snapshots from file.
 
+    Reads the columnar layout written by save_snapshots and falls back to
+    the legacy one-object-per-page layout.
+
     Args:
         path: The path to the snapshots file.
 
@@ -303,17 +364,31 @@ def load_snapshots(path: Path) -> dict[str, PageSnapshot]:
         return {}
 
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        snapshots = {}
-        for page_name, snapshot_data in data.items():
-            snapshots[page_name] = PageSnapshot(
-                page_name=snapshot_data["page_name"],
-                content=snapshot_data["content"],
-                timestamp=snapshot_data["timestamp"],
-                diff=snapshot_data.get("diff")
+        data = json.loads(path.read_bytes())
+        if isinstance(data.get("page_names"), list):
+            page_names = data["page_names"]
+            rows = zip(
+                page_names,
+                data["contents"],
+                data["timestamps"],
+                data["diffs"],
+                strict=True
+            )
+            # Positional construction via starmap keeps the per-page work
+            # in C; field order matches PageSnapshot.
+            return dict(zip(page_names, starmap(PageSnapshot, rows)))
+        return {
+            page_name: PageSnapshot(
+                snapshot_data["page_name"],
+                snapshot_data["content"],
+                snapshot_data["timestamp"],
+                snapshot_data.get("diff")
             )
-        return snapshots
-    except (OSError, ValueError, json.JSONDecodeError) as e:
+            for page_name, snapshot_data in data.items()
+        }
+    except (
+        OSError, ValueError, KeyError, TypeError, json.JSONDecodeError
+    ) as e:
         print(f"Error loading snapshots: {e}")
         return {}
 
@@ -322,22 +397,27 @@ def save_snapshots(path: Path, snapshots: dict[str, PageSnapshot]):
     """
     Save page snapshots to file.
 
+    Snapshots are stored column-wise (one list per field) so field names
+    are written once rather than once per page.
+
     Args:
         path: The path to the snapshots file.
         snapshots: Dictionary of page snapshots.
     """
+    values = snapshots.values()
     data = {
-        page_name: {
-            "page_name": snapshot.page_name,
-            "content": snapshot.content,
-            "timestamp": snapshot.timestamp,
-            "diff": snapshot.diff
-        }
-        for page_name, snapshot in snapshots.items()
+        "page_names": [snapshot.page_name for snapshot in values],
+        "contents": [snapshot.content for snapshot in values],
+        "timestamps": [snapshot.timestamp for snapshot in values],
+        "diffs": [snapshot.diff for snapshot in values],
     }
-    path.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8"
+    # Compact output keeps json on its C encoder; indent forces the
+    # pure-Python path and page contents are unreadable escaped anyway.
+    atomic_write_bytes(
+        path,
+        json.dumps(
+            data, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
     )
 
 
@@ -1,18 +1,23 @@
 # -*- coding: utf-8 -*-
 import json
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
+import base64
 import hashlib
 
+from .files import atomic_write_json
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class State:
     """State for tracking seen items and content changes."""
     seen: dict[str, str]
     updated_at: str
     content_hashes: dict[str, str] = field(default_factory=dict)
     dynamic_monitored_pages: set[str] = field(default_factory=set)
+    http_validators: dict[str, dict[str, str]] = field(default_factory=dict)
 
 
 def load_state(path: Path) -> State:
@@ -30,11 +35,12 @@ def load_state(path: Path) -> State:
         )
 
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         seen = data.get("seen", {})
         updated_at = data.get("updated_at", None)
         content_hashes = data.get("content_hashes", {})
         dynamic_monitored_pages_list = data.get("dynamic_monitored_pages", [])
+        http_validators = data.get("http_validators", {})
 
         if not isinstance(seen, dict):
             seen = {}
@@ -44,12 +50,15 @@ def load_state(path: Path) -> State:
             content_hashes = {}
         if not isinstance(dynamic_monitored_pages_list, list):
             dynamic_monitored_pages_list = []
+        if not isinstance(http_validators, dict):
+            http_validators = {}
 
         return State(
             seen=seen,
             updated_at=updated_at,
             content_hashes=content_hashes,
-            dynamic_monitored_pages=set(dynamic_monitored_pages_list)
+            dynamic_monitored_pages=set(dynamic_monitored_pages_list),
+            http_validators=http_validators
         )
     except (OSError, ValueError, json.JSONDecodeError) as e:
         print(f"Error loading state from {path}: {e}")
@@ -71,27 +80,31 @@ def save_state(path: Path, state: State):
         "seen": state.seen,
         "updated_at": state.updated_at,
         "content_hashes": state.content_hashes,
-        "dynamic_monitored_pages": list(state.dynamic_monitored_pages)
+        "dynamic_monitored_pages": list(state.dynamic_monitored_pages),
+        "http_validators": state.http_validators
     }
-    path.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2),
-        encoding="utf-8"
-    )
+    atomic_write_json(path, data, indent=2)
 
 
+@lru_cache(maxsize=256)
 def get_content_hash(content: Optional[str]) -> Optional[str]:
     """
-    Get MD5 hash of content.
+    Get 128-bit BLAKE2b hash of content.
+
+    The digest is stored as unpadded base64 (22 chars) to keep the state
+    file compact. Results are cached so the same page source is hashed
+    once per run.
 
     Args:
         content: The content to hash. If None, returns None.
 
     Returns:
-        str: MD5 hash of the content, or None if content is None.
+        str: Base64 encoded hash of the content, or None if content is None.
     """
     if not content:
         return None
-    return hashlib.md5(content.encode()).hexdigest()
+    digest = hashlib.blake2b(content.encode(), digest_size=16).digest()
+    return base64.b64encode(digest).decode("ascii").rstrip("=")
 
 
 def has_page_content_changed(
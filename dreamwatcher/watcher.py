@@ -1,19 +1,19 @@
 # -*- coding: utf-8 -*-
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional
-from concurrent.futures import (
-    ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
-)
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from operator import itemgetter
+import heapq
 import re
 
 from .wiki import WikiClient, WikiApiConfig, WikiAuth
 from .discord import WebhookClient, Event
 from .emoji import Emoji
 from .state import (
-    State, load_state, save_state,
-    has_page_content_changed, get_content_hash
+    State, load_state, save_state, get_content_hash
 )
 from .snapshot import (
     load_snapshots, save_snapshots, update_snapshot,
@@ -23,7 +23,12 @@ from .types import SecretStr
 
 
 MAX_WORKERS = 8
+PAGE_FETCH_TIMEOUT_SEC = 10.0
+JST = timezone(timedelta(hours=9), name="JST")
 _PAGE_LINK_RE = re.compile(r"\[\[([^\]]+)\]\]")
+_FIRST_LINE_RE = re.compile(r"\s*(.*)")
+# Added lines of a unified diff, excluding the "+++" file header.
+_ADDED_LINE_RE = re.compile(r"^\+(?!\+\+).*", re.MULTILINE)
 
 
 @dataclass(frozen=True)
@@ -44,6 +49,10 @@ class Config:
         monitor_recent_created: Whether to monitor the RecentCreated page.
         auto_track_pattern: Pattern to auto-track pages from RecentCreated.
         diff_full_pages: List of page names to diff full pages.
+        max_workers: Maximum number of pages fetched concurrently.
+        page_fetch_timeout_sec: Seconds to wait for a batch of page
+            fetches before giving up on the pages still pending.
+        wiki_base: wiki_url without trailing slash, derived on creation.
     """
     wiki_id: str
     api_key_id: SecretStr = field(repr=False)
@@ -57,6 +66,14 @@ class Config:
     monitor_recent_created: bool = True
     auto_track_patterns: list[str] = field(default_factory=list)
     diff_full_pages: list[str] = field(default_factory=list)
+    max_workers: int = MAX_WORKERS
+    page_fetch_timeout_sec: float = PAGE_FETCH_TIMEOUT_SEC
+    wiki_base: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Event URLs are built from the wiki URL without its trailing
+        # slash; strip it once here instead of for every event.
+        object.__setattr__(self, "wiki_base", self.wiki_url.rstrip("/"))
 
     def __repr__(self) -> str:
         return "<Config: hidden>"
@@ -73,18 +90,22 @@ class PageCheckResult:
     page_date: Optional[str]
 
 
+@lru_cache(maxsize=8192)
 def normalize_link(link: str) -> str:
     """Normalize a link."""
-    return link.strip().rstrip("/")
+    if link and (link[0].isspace() or link[-1].isspace()):
+        link = link.strip()
+    return link.rstrip("/") if link.endswith("/") else link
 
 
 def prune_state(seen: dict[str, str], max_items: int):
     """Prune the state."""
-    if len(seen) <= max_items:
+    excess = len(seen) - max_items
+    if excess <= 0:
         return
 
-    keys = sorted(seen.keys(), key=lambda k: seen.get(k, ""))
-    for key in keys[:len(keys) - max_items]:
+    oldest = heapq.nsmallest(excess, seen.items(), key=itemgetter(1))
+    for key, _ in oldest:
         del seen[key]
 
 
@@ -103,6 +124,19 @@ def _filter_links(_item, _state: State, _mode: str):
     return True
 
 
+def _format_page_list(page_names: list[str]) -> str:
+    """
+    Format page names as a bulleted list, one page per line.
+
+    Args:
+        page_names: Page names to list. Must not be empty.
+
+    Returns:
+        str: The page names, each prefixed with "・".
+    """
+    return "・" + "\n・".join(page_names)
+
+
 def _extract_page_names_from_diff(diff_text: str) -> list[str]:
     """
     Extract page names from RecentCreated and RecentChanges diff.
@@ -116,10 +150,8 @@ def _extract_page_names_from_diff(diff_text: str) -> list[str]:
         list[str]: List of extracted page names.
     """
     page_names = []
-    for line in diff_text.split("\n"):
-        if line.startswith("+") and not line.startswith("+++"):
-            matches = _PAGE_LINK_RE.findall(line)
-            page_names.extend(matches)
+    for line in _ADDED_LINE_RE.findall(diff_text):
+        page_names.extend(_PAGE_LINK_RE.findall(line))
     return page_names
 
 
@@ -135,15 +167,10 @@ def _is_page_closed(page_content: str) -> bool:
     """
     if not page_content:
         return False
-    lines = page_content.split("\n")
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if stripped.startswith("* 【終了】") or stripped.startswith("*【終了】"):
-            return True
-        break
-    return False
+    # Only the first non-blank line matters; the match skips leading
+    # whitespace and stops at its end instead of splitting the page.
+    first_line = _FIRST_LINE_RE.match(page_content).group(1).strip()
+    return first_line.startswith(("* 【終了】", "*【終了】"))
 
 
 def _matches_pattern(page_name: str, patterns: list[str]) -> bool:
@@ -159,12 +186,20 @@ def _matches_pattern(page_name: str, patterns: list[str]) -> bool:
     """
     if not patterns:
         return False
-    for pattern in patterns:
-        if re.match(pattern, page_name):
+    for compiled in _compile_patterns(tuple(patterns)):
+        if compiled.match(page_name):
             return True
     return False
 
 
+@lru_cache(maxsize=32)
+def _compile_patterns(
+    patterns: tuple[str, ...]
+) -> tuple[re.Pattern, ...]:
+    """Compile auto-track patterns once per distinct pattern list."""
+    return tuple(re.compile(pattern) for pattern in patterns)
+
+
 def _auto_track_matching_pages(
     page_names: list[str],
     cfg: Config,
@@ -186,30 +221,64 @@ def _auto_track_matching_pages(
     if not cfg.auto_track_patterns:
         return []
 
-    auto_tracked_pages = []
-    for page_name in page_names:
-        if not _matches_pattern(page_name, cfg.auto_track_patterns):
-            continue
-        if page_name in state.dynamic_monitored_pages:
-            continue
-        try:
-            page_data = client.get_page(page_name)
-            page_content = page_data.get("source")
-            page_date = page_data.get("timestamp")
-            if page_content and not _is_page_closed(page_content):
-                state.dynamic_monitored_pages.add(page_name)
-                content_key = f"content_{page_name}"
-                state.content_hashes[content_key] = (
-                    get_content_hash(page_content)
-                )
-                page_key = normalize_link(f"page/{page_name}")
-                if page_date:
-                    state.seen[page_key] = page_date
-                auto_tracked_pages.append(page_name)
-        except (OSError, ValueError, TimeoutError) as e:
-            print(f"Error checking page '{page_name}': {e}")
+    candidates = [
+        page_name for page_name in dict.fromkeys(page_names)
+        if _matches_pattern(page_name, cfg.auto_track_patterns)
+        and page_name not in state.dynamic_monitored_pages
+    ]
+    return _register_pages(candidates, state, client, cfg.max_workers)
+
+
+def _register_pages(
+    page_names: list[str],
+    state: State,
+    client: WikiClient,
+    max_workers: int = MAX_WORKERS
+) -> list[str]:
+    """
+    Start monitoring pages that are still open.
+
+    The pages are fetched concurrently; registering them in state happens
+    afterwards on the calling thread, in the order given.
+
+    Args:
+        page_names: Names of the pages to register, without duplicates.
+        state: Current state object.
+        client: WikiClient instance.
+        max_workers: Maximum number of pages fetched concurrently.
+
+    Returns:
+        list[str]: Names of the pages that were registered.
+    """
+    if not page_names:
+        return []
+
+    registered_pages = []
+    max_workers = max(1, min(max_workers, len(page_names)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            (page_name, executor.submit(client.get_page, page_name))
+            for page_name in page_names
+        ]
+        for page_name, future in futures:
+            try:
+                page_data = future.result()
+                page_content = page_data.get("source")
+                page_date = page_data.get("timestamp")
+                if page_content and not _is_page_closed(page_content):
+                    state.dynamic_monitored_pages.add(page_name)
+                    content_key = f"content_{page_name}"
+                    state.content_hashes[content_key] = (
+                        get_content_hash(page_content)
+                    )
+                    page_key = normalize_link(f"page/{page_name}")
+                    if page_date:
+                        state.seen[page_key] = page_date
+                    registered_pages.append(page_name)
+            except (OSError, ValueError, TimeoutError) as e:
+                print(f"Error checking page '{page_name}': {e}")
 
-    return auto_tracked_pages
+    return registered_pages
 
 
 def _check_monitored_pages(
@@ -235,8 +304,7 @@ def _check_monitored_pages(
     """
     if not pages_to_check:
         return
-    max_workers = min(MAX_WORKERS, len(pages_to_check))
-    per_batch_timeout = 10
+    max_workers = max(1, min(cfg.max_workers, len(pages_to_check)))
 
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {
@@ -244,80 +312,73 @@ def _check_monitored_pages(
             for page in pages_to_check
         }
 
-        try:
-            for future in as_completed(futures, timeout=per_batch_timeout):
-                p_name = futures[future]
-                try:
-                    p_data = future.result()
-                    event = _check_page_data(
-                        p_name,
-                        p_data,
-                        state,
-                        cfg
-                    )
-                    if not event:
-                        continue
-
-                    p_content = p_data.get("source")
-                    p_date = p_data.get("timestamp")
-                    p_key = f"content_{p_name}"
-
-                    if p_content:
-                        if _is_page_closed(p_content):
-                            state.dynamic_monitored_pages.discard(p_name)
-
-                        p_old = state.content_hashes.get(p_key)
-                        p_new = get_content_hash(p_content)
-                        state.content_hashes[p_key] = p_new
-                        if p_old != p_new:
-                            p_snap = update_snapshot(
-                                page_name=p_name,
-                                current_content=p_content,
-                                snapshots=snapshots,
-                                timestamp=p_date
-                            )
-                            updated_snapshots[p_name] = p_snap
-
-                    if event:
-                        diff_prev = None
-                        if not event.is_initial:
-                            evt_snap = updated_snapshots.get(p_name)
-                            if evt_snap:
-                                diff_prev = get_content_diff_preview(
-                                    evt_snap,
-                                    full_diff_page_names=cfg.diff_full_pages,
-                                )
-                        if event.is_initial or diff_prev:
-                            evt = Event(
-                                title=event.title,
-                                url=event.url,
-                                page_name=event.page_name,
-                                date=event.date,
-                                diff_preview=diff_prev,
-                                is_initial=event.is_initial
-                            )
-                            events.append(evt)
-                except (
-                    OSError,
-                    ValueError,
-                    TimeoutError
-                ) as e:
-                    print(f"Error getting page '{p_name}': {e}")
-
-        except FuturesTimeoutError:
-            for future in futures:
-                if not future.done():
-                    future.cancel()
+        done, not_done = wait(
+            futures, timeout=cfg.page_fetch_timeout_sec
+        )
+        if not_done:
+            executor.shutdown(wait=False, cancel_futures=True)
             pending_pages = [
                 page for future, page in futures.items()
-                if not future.done()
+                if future in not_done
             ]
-            if pending_pages:
-                num = len(pending_pages)
-                print(
-                    "Timeout while fetching monitored pages; "
-                    f"cancelled {num} pending request(s): {pending_pages}"
+            num = len(pending_pages)
+            print(
+                "Timeout while fetching monitored pages; "
+                f"cancelled {num} pending request(s): {pending_pages}"
+            )
+
+        # Walk the futures in submission order so events come out in a
+        # stable order regardless of which request finished first.
+        for future, p_name in futures.items():
+            if future not in done:
+                continue
+            try:
+                p_data = future.result()
+                event = _check_page_data(
+                    p_name,
+                    p_data,
+                    state,
+                    cfg
                 )
+                if not event:
+                    continue
+
+                p_content = p_data.get("source")
+                p_new = get_content_hash(p_content)
+                p_date = p_data.get("timestamp")
+                p_key = f"content_{p_name}"
+
+                if p_content:
+                    if _is_page_closed(p_content):
+                        state.dynamic_monitored_pages.discard(p_name)
+
+                    p_old = state.content_hashes.get(p_key)
+                    state.content_hashes[p_key] = p_new
+                    if p_old != p_new:
+                        p_snap = update_snapshot(
+                            page_name=p_name,
+                            current_content=p_content,
+                            snapshots=snapshots,
+                            timestamp=p_date
+                        )
+                        updated_snapshots[p_name] = p_snap
+
+                diff_prev = None
+                if not event.is_initial:
+                    evt_snap = updated_snapshots.get(p_name)
+                    if evt_snap:
+                        diff_prev = get_content_diff_preview(
+                            evt_snap,
+                            full_diff_page_names=cfg.diff_full_pages,
+                        )
+                if event.is_initial or diff_prev:
+                    events.append(replace(event, diff_preview=diff_prev))
+            except (
+                OSError,
+                ValueError,
+                TimeoutError
+            ) as e:
+                print(f"Error getting page '{p_name}': {e}")
 
 
 def create_wiki_client(cfg: Config) -> WikiClient:
@@ -330,17 +391,61 @@ def create_wiki_client(cfg: Config) -> WikiClient:
     Returns:
         WikiClient: Initialized WikiClient instance.
     """
-    api_cfg = WikiApiConfig(wiki_id=cfg.wiki_id)
+    # One connection per fetch worker plus one for the RecentCreated prefetch.
+    api_cfg = WikiApiConfig(
+        wiki_id=cfg.wiki_id,
+        pool_maxsize=max(cfg.max_workers + 1, 10)
+    )
     auth = WikiAuth(api_key_id=cfg.api_key_id, secret=cfg.api_secret)
     return WikiClient(api_cfg, auth)
 
 
+def _page_validators(page_name: str, state: State) -> dict[str, str]:
+    """
+    Get the validators to revalidate a page with.
+
+    Only pages whose content we already know are revalidated; a 304 must
+    never stand in for a page that has no stored baseline.
+
+    Args:
+        page_name: The name of the page.
+        state: The state object.
+
+    Returns:
+        dict[str, str]: A copy of the stored validators, possibly empty.
+    """
+    if not state.content_hashes.get(f"content_{page_name}"):
+        return {}
+    return dict(state.http_validators.get(page_name, {}))
+
+
+def _request_page(
+    page_name: str,
+    client: WikiClient,
+    validators: dict[str, str]
+) -> tuple[Optional[dict], dict[str, str]]:
+    """
+    Request a page without touching state, so it can run on any thread.
+
+    Args:
+        page_name: The name of the page.
+        client: The WikiClient instance.
+        validators: Validators from _page_validators; updated in place.
+
+    Returns:
+        tuple[Optional[dict], dict[str, str]]: The page, or None if not
+            modified, and the updated validators.
+    """
+    return client.get_page_if_modified(page_name, validators), validators
+
+
 def _fetch_page(
     page_name: str,
     client: WikiClient,
     state: State,
     snapshots: dict,
-    updated_snapshots: dict
+    updated_snapshots: dict,
+    prefetched: Optional[Future] = None
 ) -> PageCheckResult:
     """
     Fetch a page.
@@ -351,16 +456,37 @@ def _fetch_page(
         state: The state object.
         snapshots: The snapshots dictionary.
         updated_snapshots: The updated snapshots dictionary.
+        prefetched: Future of a _request_page call for the page that was
+            started earlier. Requested here when omitted.
 
     Returns:
         PageCheckResult: The page check result.
     """
-    page_data = client.get_page(page_name)
-    page_content = page_data.get("source")
-    page_date = page_data.get("timestamp")
+    if prefetched is not None:
+        page_data, validators = prefetched.result()
+    else:
+        page_data, validators = _request_page(
+            page_name, client, _page_validators(page_name, state)
+        )
 
     content_key = f"content_{page_name}"
     old_hash = state.content_hashes.get(content_key)
+    if validators:
+        state.http_validators[page_name] = validators
+    else:
+        state.http_validators.pop(page_name, None)
+    if page_data is None:
+        return PageCheckResult(
+            page_name=page_name,
+            is_initial=False,
+            has_changed=False,
+            snapshot=None,
+            page_content=None,
+            page_date=None
+        )
+    page_content = page_data.get("source")
+    page_date = page_data.get("timestamp")
+
     new_hash = get_content_hash(page_content) if page_content else None
     if new_hash:
         state.content_hashes[content_key] = new_hash
@@ -425,7 +551,7 @@ def get_recent_changes_updates(
 
         if result.is_initial:
             page_url = (
-                f"{cfg.wiki_url.rstrip("/")}/?{result.page_name}"
+                f"{cfg.wiki_base}/?{result.page_name}"
                 if cfg.wiki_url
                 else result.page_name
             )
@@ -441,56 +567,22 @@ def get_recent_changes_updates(
             )
             events.append(initial_event)
 
-        if result.has_changed and result.snapshot:
-            if result.snapshot.diff:
-                updated_page_names = (
-                    _extract_page_names_from_diff(
-                        result.snapshot.diff
-                    )
-                )
-                pages_to_check = [
-                    p for p in updated_page_names
-                    if p in all_monitored_pages
-                ]
-                if pages_to_check:
-                    _check_monitored_pages(
-                        pages_to_check,
-                        client,
-                        state,
-                        cfg,
-                        snapshots,
-                        updated_snapshots,
-                        events
-                    )
-
-                auto_tracked_pages = _auto_track_matching_pages(
-                    updated_page_names, cfg, state, client
-                )
-                if auto_tracked_pages:
-                    page_list = "\n".join(
-                        [f"・{page}" for page in auto_tracked_pages]
-                    )
-                    tracked_event = Event(
-                        title=(
-                            f"{Emoji.initial} "
-                            f"ページが{len(auto_tracked_pages)}件 "
-                            "通知登録されました"
-                        ),
-                        url=f"{cfg.wiki_url.rstrip('/')}/?RecentChanges",
-                        page_name="RecentChanges",
-                        date=result.page_date,
-                        diff_preview=page_list,
-                        is_initial=False
-                    )
-                    events.append(tracked_event)
-
-        new_pages = [
-            p for p in all_monitored_pages
-            if f"content_{p}" not in state.content_hashes
-        ]
-        if new_pages:
+        # Newly monitored pages and pages listed in the RecentChanges diff
+        # are fetched in a single concurrent batch.
+        updated_page_names = []
+        if result.has_changed and result.snapshot and result.snapshot.diff:
+            updated_page_names = _extract_page_names_from_diff(
+                result.snapshot.diff
+            )
+        pages_to_check = list(dict.fromkeys(
+            [p for p in updated_page_names if p in all_monitored_pages] + [
+                p for p in all_monitored_pages
+                if f"content_{p}" not in state.content_hashes
+            ]
+        ))
+        if pages_to_check:
             _check_monitored_pages(
-                new_pages,
+                pages_to_check,
                 client,
                 state,
                 cfg,
@@ -498,6 +590,25 @@ def get_recent_changes_updates(
                 updated_snapshots,
                 events
             )
+
+        auto_tracked_pages = _auto_track_matching_pages(
+            updated_page_names, cfg, state, client
+        )
+        if auto_tracked_pages:
+            page_list = _format_page_list(auto_tracked_pages)
+            tracked_event = Event(
+                title=(
+                    f"{Emoji.initial} "
+                    f"ページが{len(auto_tracked_pages)}件 "
+                    "通知登録されました"
+                ),
+                url=f"{cfg.wiki_base}/?RecentChanges",
+                page_name="RecentChanges",
+                date=result.page_date,
+                diff_preview=page_list,
+                is_initial=False
+            )
+            events.append(tracked_event)
     except (OSError, ValueError, TimeoutError) as e:
         print(f"Error getting page 'RecentChanges': {e}")
 
@@ -512,52 +623,19 @@ def _process_initial_pages(
     client: WikiClient,
     events: list
 ) -> None:
-    lines = page_content.split("\n")
-    auto_tracked_pages = []
-    for line in lines:
-        page_names = _extract_page_names_from_diff(line)
-        for created_page_name in page_names:
-            if _matches_pattern(
-                created_page_name,
-                cfg.auto_track_patterns
-            ):
-                try:
-                    page_data_for_check = client.get_page(
-                        created_page_name
-                    )
-                    page_content_for_check = (
-                        page_data_for_check.get("source")
-                    )
-                    page_date_for_check = page_data_for_check.get("timestamp")
-                    if page_content_for_check:
-                        if not _is_page_closed(
-                            page_content_for_check
-                        ):
-                            state.dynamic_monitored_pages.add(
-                                created_page_name
-                            )
-                            auto_tracked_pages.append(
-                                created_page_name
-                            )
-                            content_key = f"content_{created_page_name}"
-                            state.content_hashes[content_key] = (
-                                get_content_hash(page_content_for_check)
-                            )
-                            page_key = normalize_link(f"page/{created_page_name}")
-                            if page_date_for_check:
-                                state.seen[page_key] = page_date_for_check
-                except (
-                    OSError, ValueError, TimeoutError
-                ) as e:
-                    print(
-                        f"Error checking page "
-                        f"'{created_page_name}': {e}"
-                    )
+    # A page may be listed more than once; fetch and register it once.
+    page_names = [
+        page_name for page_name in dict.fromkeys(
+            _extract_page_names_from_diff(page_content)
+        )
+        if _matches_pattern(page_name, cfg.auto_track_patterns)
+    ]
+    auto_tracked_pages = _register_pages(
+        page_names, state, client, cfg.max_workers
+    )
 
     if auto_tracked_pages:
-        page_list = "\n".join(
-            [f"・{page}" for page in auto_tracked_pages]
-        )
+        page_list = _format_page_list(auto_tracked_pages)
         created_event = Event(
             title=(
                 f"{Emoji.initial} "
@@ -608,15 +686,13 @@ def _process_updated_pages(
         page_names, cfg, state, client
     )
     if auto_tracked_pages:
-        page_list = "\n".join(
-            [f"・{page}" for page in auto_tracked_pages]
-        )
+        page_list = _format_page_list(auto_tracked_pages)
         tracked_event = Event(
             title=(
                 f"{Emoji.initial} "
                 f"ページが{len(auto_tracked_pages)}件 通知登録されました"
             ),
-            url=f"{cfg.wiki_url.rstrip('/')}/?RecentCreated",
+            url=f"{cfg.wiki_base}/?RecentCreated",
             page_name="RecentCreated",
             date=page_date,
             diff_preview=page_list,
@@ -631,6 +707,7 @@ def get_recent_created_updates(
     client: WikiClient,
     snapshots: dict,
     updated_snapshots: dict,
+    prefetched: Optional[Future] = None,
 ) -> list[Event]:
     """
     Get updates from the RecentCreated page.
@@ -641,6 +718,8 @@ def get_recent_created_updates(
         client: WikiClient instance.
         snapshots: Current snapshots dictionary.
         updated_snapshots: Dictionary to store updated snapshots.
+        prefetched: Future of a _request_page call for RecentCreated that
+            was started earlier. Fetched here when omitted.
 
     Returns:
         list[Event]: List of events for newly created pages.
@@ -655,7 +734,8 @@ def get_recent_created_updates(
             client=client,
             state=state,
             snapshots=snapshots,
-            updated_snapshots=updated_snapshots
+            updated_snapshots=updated_snapshots,
+            prefetched=prefetched
         )
 
         if result.is_initial:
@@ -665,7 +745,7 @@ def get_recent_created_updates(
                     client, events
                 )
             page_url = (
-                f"{cfg.wiki_url.rstrip('/')}/?{result.page_name}"
+                f"{cfg.wiki_base}/?{result.page_name}"
                 if cfg.wiki_url
                 else result.page_name
             )
@@ -711,6 +791,9 @@ def _check_page_data(
     Returns:
         Optional[Event]: Event if page is new or updated, None otherwise.
     """
+    if event_type == "created":
+        return None
+
     page_path = f"page/{page_name}"
     page_key = normalize_link(page_path)
     page_title = page_data.get("page", page_name)
@@ -718,16 +801,13 @@ def _check_page_data(
     page_content = page_data.get("source")
 
     page_url = (
-        f"{cfg.wiki_url.rstrip("/")}/?{page_name}"
-        if cfg.wiki_url
-        else page_name
+        f"{cfg.wiki_base}/?{page_name}" if cfg.wiki_base else page_name
     )
 
-    if event_type == "created":
-        return None
     page_event_title = f"{Emoji.update} 【{page_title}】 が更新されました。"
 
-    is_page_first_run = f"content_{page_name}" not in state.content_hashes
+    content_key = f"content_{page_name}"
+    is_page_first_run = content_key not in state.content_hashes
 
     if is_page_first_run:
         return Event(
@@ -735,29 +815,51 @@ def _check_page_data(
             url=page_url,
             page_name=page_name,
             date=page_date,
-            is_initial=True
+            is_initial=True,
+            page_key=page_key
         )
 
     stored_date = state.seen.get(page_key)
     if page_date and stored_date != page_date:
-        if page_content and has_page_content_changed(
-            page_name, page_content, state
-        ):
+        new_hash = get_content_hash(page_content)
+        if new_hash and state.content_hashes[content_key] != new_hash:
             return Event(
                 title=page_event_title,
                 url=page_url,
                 page_name=page_name,
-                date=page_date
+                date=page_date,
+                page_key=page_key
             )
 
     return None
 
 
+def _monitored_page_names(cfg: Config, state: State) -> set[str]:
+    """
+    Get names of all pages currently being monitored.
+
+    Args:
+        cfg: Configuration object.
+        state: Current state object.
+
+    Returns:
+        set[str]: Monitored page names, including RecentChanges and
+            RecentCreated when they are polled.
+    """
+    page_names = set(cfg.page_names) | state.dynamic_monitored_pages
+    if page_names:
+        page_names.add("RecentChanges")
+    if cfg.monitor_recent_created:
+        page_names.add("RecentCreated")
+    return page_names
+
+
 def clean_monitored_state(
     seen: dict[str, str],
     content_hashes: dict[str, str],
     cfg: Config,
-    state: State
+    state: State,
+    monitored_pages: Optional[set[str]] = None
 ) -> tuple[dict[str, str], dict[str, str]]:
     """Remove pages that are no longer being monitored from state.
 
@@ -766,43 +868,25 @@ def clean_monitored_state(
         content_hashes: Current content hashes.
         cfg: Configuration object.
         state: Current state object.
+        monitored_pages: Result of _monitored_page_names() if the caller
+            already has it. Computed from cfg and state when omitted.
 
     Returns:
         Tuple of (cleaned_seen, cleaned_hashes)
     """
-    monitored_page_keys = {
-        normalize_link(f"page/{page_name}")
-        for page_name in cfg.page_names
-    }
+    if monitored_pages is None:
+        monitored_pages = _monitored_page_names(cfg, state)
 
-    # Add dynamic monitored pages
-    for page_name in state.dynamic_monitored_pages:
+    monitored_page_keys = set()
+    monitored_content_keys = set()
+    for page_name in monitored_pages:
         monitored_page_keys.add(normalize_link(f"page/{page_name}"))
-
-    if cfg.monitor_recent_created:
-        monitored_page_keys.add(normalize_link("page/RecentCreated"))
-
-    if cfg.page_names or state.dynamic_monitored_pages:
-        monitored_page_keys.add(normalize_link("page/RecentChanges"))
+        monitored_content_keys.add(f"content_{page_name}")
 
     cleaned_seen = {
         k: v for k, v in seen.items()
         if k in monitored_page_keys or not k.startswith("page/")
     }
-
-    monitored_content_keys = {
-        f"content_{page_name}" for page_name in cfg.page_names
-    }
-
-    for page_name in state.dynamic_monitored_pages:
-        monitored_content_keys.add(f"content_{page_name}")
-
-    if cfg.monitor_recent_created:
-        monitored_content_keys.add("content_RecentCreated")
-
-    if cfg.page_names or state.dynamic_monitored_pages:
-        monitored_content_keys.add("content_RecentChanges")
-
     cleaned_hashes = {
         k: v for k, v in content_hashes.items()
         if k in monitored_content_keys
@@ -814,57 +898,97 @@ def clean_monitored_state(
 def run(cfg: Config) -> int:
     """Run watcher."""
     state = load_state(cfg.state_path)
+    # Validators can change on a run that has nothing to report; keep a
+    # copy so such runs still save them for the next conditional GET.
+    http_validators_before = {
+        page_name: dict(validators)
+        for page_name, validators in state.http_validators.items()
+    }
 
     events_to_send = []
 
-    wiki_client = create_wiki_client(cfg)
-
     cfg.snapshots_dir.mkdir(parents=True, exist_ok=True)
     snapshots_path = cfg.snapshots_dir / "snapshots.json"
     snapshots = load_snapshots(snapshots_path)
     updated_snapshots: dict = {}
 
-    page_events = get_recent_changes_updates(
-        cfg, state, wiki_client, snapshots, updated_snapshots
-    )
-    events_to_send.extend(page_events)
+    # One client (and one pooled session) serves every wiki request.
+    with (
+        create_wiki_client(cfg) as wiki_client,
+        ThreadPoolExecutor(max_workers=1) as prefetcher
+    ):
+        # RecentCreated is requested while RecentChanges is processed.
+        # Only the HTTP request runs on the prefetch thread; state and
+        # snapshots are updated on this thread once it is done, and
+        # auto-tracking stays sequential so a page listed on both is
+        # registered once.
+        recent_created = None
+        if cfg.monitor_recent_created:
+            recent_created = prefetcher.submit(
+                _request_page,
+                "RecentCreated",
+                wiki_client,
+                _page_validators("RecentCreated", state)
+            )
 
-    recent_created_events = get_recent_created_updates(
-        cfg, state, wiki_client, snapshots, updated_snapshots
-    )
-    events_to_send.extend(recent_created_events)
+        page_events = get_recent_changes_updates(
+            cfg, state, wiki_client, snapshots, updated_snapshots
+        )
+        events_to_send.extend(page_events)
+
+        recent_created_events = get_recent_created_updates(
+            cfg, state, wiki_client, snapshots, updated_snapshots,
+            prefetched=recent_created
+        )
+        events_to_send.extend(recent_created_events)
+
+    # Fetching is over, so the monitored set no longer changes; build it
+    # once for both the snapshot and the state cleanup.
+    monitored_pages = _monitored_page_names(cfg, state)
 
     if updated_snapshots:
         snapshots.update(updated_snapshots)
+        # Drop snapshots of pages that are no longer monitored so the
+        # file only carries contents that a future run can diff against.
+        snapshots = {
+            name: snapshot for name, snapshot in snapshots.items()
+            if name in monitored_pages
+        }
         save_snapshots(snapshots_path, snapshots)
 
     if events_to_send:
-        client = WebhookClient(cfg.discord_webhook_url)
-        client.send_events(events_to_send, header="")
+        with WebhookClient(cfg.discord_webhook_url) as client:
+            client.send_events(events_to_send, header="")
 
-    if not (events_to_send or updated_snapshots):
+    validators_changed = state.http_validators != http_validators_before
+    if not (events_to_send or updated_snapshots or validators_changed):
         return 0
 
-    updated_seen = state.seen.copy()
+    # clean_monitored_state builds fresh dicts, so record event dates
+    # directly on the loaded state instead of copying it first.
     for event in events_to_send:
         event_date = event.date
-        page_key = normalize_link(f"page/{event.page_name}")
-        updated_seen[page_key] = event_date
+        page_key = (
+            event.page_key or normalize_link(f"page/{event.page_name}")
+        )
+        state.seen[page_key] = event_date
 
     updated_seen, updated_hashes = clean_monitored_state(
-        updated_seen,
+        state.seen,
         state.content_hashes,
         cfg,
-        state
+        state,
+        monitored_pages
     )
 
     prune_state(updated_seen, max_items=5000)
 
     updated_state = State(
         seen=updated_seen,
-        updated_at=datetime.now(timezone(timedelta(hours=9))).isoformat(),
+        updated_at=datetime.now(JST).isoformat(),
         content_hashes=updated_hashes,
-        dynamic_monitored_pages=state.dynamic_monitored_pages
+        dynamic_monitored_pages=state.dynamic_monitored_pages,
+        http_validators=state.http_validators
     )
 
     save_state(cfg.state_path, updated_state)
@@ -1,9 +1,20 @@
 # -*- coding: utf-8 -*-
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from importlib.metadata import packages_distributions
+from json import loads as _json_loads
+from itertools import takewhile
 from pathlib import Path
 from typing import Any, Dict, Optional
 from urllib.parse import quote
+import hashlib
+import json
+import os
+import random
+import stat
+import tempfile
+import threading
+import time
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -11,6 +22,11 @@ from urllib3.util.retry import Retry
 from .types import SecretStr
 
 
+CIRCUIT_OPEN_THRESHOLD = 5
+CIRCUIT_OPEN_SEC = 30.0
+TOKEN_REFRESH_MARGIN_SEC = 60.0
+
+
 def _project_name() -> str:
     pkg = (__package__ or "").split(".", maxsplit=1)[0]
     dists = packages_distributions().get(pkg, [])
@@ -19,10 +35,80 @@ def _project_name() -> str:
     return Path(__file__).resolve().parent.parent.name
 
 
+def _token_cache_path(wiki_id: str, api_key_id: str) -> Path:
+    """
+    Get the path of the on-disk token cache for a wiki and API key.
+
+    Args:
+        wiki_id: The ID of the wiki.
+        api_key_id: The API key ID.
+
+    Returns:
+        Path: The path of the cache file in the user's cache directory.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    key = hashlib.sha256(f"{wiki_id}\0{api_key_id}".encode("utf-8"))
+    return Path(cache_home) / "uro-dreamwatcher" / (
+        f"token-{key.hexdigest()[:16]}.json"
+    )
+
+
+def _is_private_file(st: os.stat_result) -> bool:
+    """
+    Check that a file is a regular file only its owner, this user, can use.
+
+    Args:
+        st: The result of stat on the open file.
+
+    Returns:
+        bool: True if the file is safe to read a token from.
+    """
+    if not stat.S_ISREG(st.st_mode) or st.st_mode & 0o077:
+        return False
+    return not hasattr(os, "getuid") or st.st_uid == os.getuid()
+
+
 class ApiError(RuntimeError):
     """Wikiwiki API error."""
 
 
+class CircuitOpenError(ApiError):
+    """
+    Request skipped because the API kept failing.
+
+    Like any ApiError it ends the run before state is saved, so pages
+    that could not be checked are checked again by the next run.
+    """
+
+
+class _JitterRetry(Retry):
+    """
+    Retry with full-jitter exponential backoff.
+
+    Each delay is drawn uniformly between zero and the exponential bound,
+    so clients failing together do not retry in lockstep. A Retry-After
+    from the server is honoured with up to 20% extra delay for the same
+    reason.
+    """
+    BACKOFF_CAP_SEC = 15.0
+
+    def get_backoff_time(self) -> float:
+        consecutive_errors = len(list(takewhile(
+            lambda h: h.redirect_location is None, reversed(self.history)
+        )))
+        if not consecutive_errors:
+            return 0.0
+        bound = self.backoff_factor * (2 ** (consecutive_errors - 1))
+        return random.uniform(0.0, min(bound, self.BACKOFF_CAP_SEC))
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        # Only ever extend the hint; retrying early invites another 429.
+        return retry_after * random.uniform(1.0, 1.2)
+
+
 @dataclass(frozen=True)
 class WikiAuth:
     """Wikiwiki authentication."""
@@ -39,35 +125,91 @@ class WikiApiConfig:
     wiki_id: str
     base_url: str = "https://api.wikiwiki.jp"
     timeout_sec: int = 10
+    pool_maxsize: int = 10
+    token_ttl_sec: int = 3500
+    token_cache: bool = True
 
 
 class WikiClient:
-    """Wikiwiki client."""
+    """
+    Wikiwiki client.
+
+    Pages returned by get_page are kept for the lifetime of the client, so
+    a client is meant to serve a single watcher run. The auth token is
+    cached in the user's cache directory (mode 0600) so the next run can
+    skip POST /auth.
+
+    After CIRCUIT_OPEN_THRESHOLD consecutive server errors or connection
+    failures, requests fail immediately with CircuitOpenError for
+    CIRCUIT_OPEN_SEC instead of waiting out retries against an API that is
+    down.
+    """
     def __init__(self, cfg: WikiApiConfig, auth: WikiAuth):
         self._cfg = cfg
         self._auth = auth
+        self._base_url = cfg.base_url.rstrip("/")
+        self._base_prefix = self._base_url + "/"
+        self._auth_url_suffix = f"{cfg.wiki_id}/auth"
         self._session = requests.Session()
 
-        retries = Retry(
+        retries = _JitterRetry(
             total=3,
             connect=3,
             read=3,
             backoff_factor=0.5,
             status_forcelist=(429, 500, 502, 503, 504),
             allowed_methods=("GET", "POST"),
+            respect_retry_after_header=True,
             raise_on_status=False,
         )
         adapter = HTTPAdapter(max_retries=retries,
                               pool_connections=10,
-                              pool_maxsize=10
+                              pool_maxsize=cfg.pool_maxsize
                               )
         self._session.mount("https://", adapter)
         self._session.mount("http://", adapter)
         self._token: Optional[SecretStr] = None
+        self._token_exp = 0.0
+        self._token_lock = threading.Lock()
+        self._pages: Dict[str, Future] = {}
+        self._pages_lock = threading.Lock()
+        # Resolved only when caching is on: it looks up the home directory.
+        self._token_path: Optional[Path] = (
+            _token_cache_path(cfg.wiki_id, auth.api_key_id)
+            if cfg.token_cache else None
+        )
+        self._breaker_lock = threading.Lock()
+        self._consecutive_failures = 0
+        self._circuit_opened_at = 0.0
 
         self.project_name = _project_name()
         print(f"User-Agent: {self.project_name}")
-
+        # Static headers live on the session; requests only add auth and
+        # validators on top.
+        self._session.headers.update({
+            "User-Agent": self.project_name,
+            "Accept": "application/json",
+        })
+
+    def __enter__(self) -> "WikiClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self._session.close()
+
+    @property
+    def circuit_open(self) -> bool:
+        """Whether requests are currently failing fast."""
+        with self._breaker_lock:
+            return (
+                self._consecutive_failures >= CIRCUIT_OPEN_THRESHOLD
+                and time.monotonic() - self._circuit_opened_at
+                < CIRCUIT_OPEN_SEC
+            )
 
     def list_pages(self) -> Dict[str, Any]:
         """
@@ -88,16 +230,62 @@ class WikiClient:
 
         GET /{wiki_id}/page/{page_name}
 
+        Repeated calls for the same page return the first response
+        instead of fetching it again; calls made while that fetch is in
+        flight wait for it. A failed fetch is not cached.
+
         Returns:
             Dict[str, Any]: A dictionary containing the page.
         """
+        with self._pages_lock:
+            future = self._pages.get(page_name)
+            is_owner = future is None
+            if is_owner:
+                future = self._pages[page_name] = Future()
+
+        if is_owner:
+            try:
+                token = self._get_token()
+                url = self._page_url(page_name)
+                future.set_result(self._request_json("GET", url, token=token))
+            except Exception as e:
+                with self._pages_lock:
+                    del self._pages[page_name]
+                future.set_exception(e)
+        return future.result()
+
+    def get_page_if_modified(
+        self,
+        page_name: str,
+        validators: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a page unless it is unchanged since the last fetch.
+
+        GET /{wiki_id}/page/{page_name}
+
+        Sends If-None-Match / If-Modified-Since built from validators and
+        updates validators in place from the response headers.
+
+        Args:
+            page_name: The name of the page.
+            validators: Mapping with optional "etag" and "last_modified".
+
+        Returns:
+            Optional[Dict[str, Any]]: The page, or None if not modified.
+        """
         token = self._get_token()
-        encoded_page_name = quote(page_name, safe="")
-        url = self._url(f"/{self._cfg.wiki_id}/page/{encoded_page_name}")
-        return self._request_json("GET", url, token=token)
+        url = self._page_url(page_name)
+        return self._request_json(
+            "GET", url, token=token, validators=validators
+        )
 
     def _url(self, path: str) -> str:
-        return self._cfg.base_url.rstrip("/") + path
+        return self._base_url + path
+
+    def _page_url(self, page_name: str) -> str:
+        encoded_page_name = quote(page_name, safe="")
+        return self._url(f"/{self._cfg.wiki_id}/page/{encoded_page_name}")
 
     def _get_token(self) -> str:
         """
@@ -106,18 +294,121 @@ class WikiClient:
         Returns:
             str: A token for the API.
         """
-        if self._token:
+        # Requests run on several threads; authenticate only once. A token
+        # close to expiry is replaced up front rather than after a 401.
+        with self._token_lock:
+            refresh_at = self._token_exp - TOKEN_REFRESH_MARGIN_SEC
+            if self._token and time.time() < refresh_at:
+                return self._token
+            cached = self._load_cached_token()
+            if cached:
+                self._token, self._token_exp = cached
+                return self._token
+            self._token, self._token_exp = self._auth_token()
+            self._save_cached_token(self._token, self._token_exp)
             return self._token
-        self._token = self._auth_token()
-        return self._token
 
-    def _auth_token(self) -> str:
+    def _refresh_token(self, rejected_token: str) -> str:
         """
-        Authenticate and get a token for the API.
+        Replace a token the API rejected.
+
+        Only the first thread to report a given token drops it; threads
+        that were rejected with the same token afterwards pick up the
+        replacement instead of authenticating again.
+
+        Args:
+            rejected_token: The token the API answered 401/403 for.
 
         Returns:
             str: A token for the API.
         """
+        with self._token_lock:
+            if self._token == rejected_token:
+                self._token = None
+                self._drop_cached_token()
+        return self._get_token()
+
+    def _load_cached_token(self) -> Optional[tuple[SecretStr, float]]:
+        """
+        Load a still valid token from the on-disk cache.
+
+        Symlinks and files that are not private to the current user are
+        ignored.
+
+        Returns:
+            Optional[tuple[SecretStr, float]]: The cached token and its
+                expiry as a Unix time, or None if there is none or it
+                expires within TOKEN_REFRESH_MARGIN_SEC.
+        """
+        if self._token_path is None:
+            return None
+        try:
+            fd = os.open(
+                self._token_path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0)
+            )
+            with os.fdopen(fd, "rb") as f:
+                if not _is_private_file(os.fstat(f.fileno())):
+                    return None
+                data = json.loads(f.read())
+            exp = float(data["exp"])
+            if exp > time.time() + TOKEN_REFRESH_MARGIN_SEC and data["token"]:
+                return SecretStr(data["token"]), exp
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    def _save_cached_token(self, token: str, exp: float) -> None:
+        """
+        Save a freshly issued token to the on-disk cache.
+
+        The file is created exclusively with mode 0600 in a private
+        directory and renamed into place, so other users never see the
+        token, pre-planted symlinks are not followed and readers never see
+        a partial file.
+
+        Args:
+            token: The token to cache.
+            exp: The expiry of the token as a Unix time.
+        """
+        if self._token_path is None:
+            return
+        data = {"token": token, "exp": exp}
+        cache_dir = self._token_path.parent
+        try:
+            cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=cache_dir, prefix=self._token_path.name, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_name, self._token_path)
+            except OSError:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            print(f"Warning: could not cache auth token: {e}")
+
+    def _drop_cached_token(self) -> None:
+        """Remove the on-disk token cache after the token was rejected."""
+        if self._token_path is None:
+            return
+        try:
+            self._token_path.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Warning: could not remove cached auth token: {e}")
+
+    def _auth_token(self) -> tuple[SecretStr, float]:
+        """
+        Authenticate and get a token for the API.
+
+        The lifetime comes from expires_in when the API sends one, and
+        from token_ttl_sec otherwise.
+
+        Returns:
+            tuple[SecretStr, float]: A token for the API and its expiry as
+                a Unix time.
+        """
         url = self._url(f"/{self._cfg.wiki_id}/auth")
         payload = {
             "api_key_id": self._auth.api_key_id,
@@ -132,7 +423,11 @@ class WikiClient:
         if status not in (None, "ok") or not token:
             raise ApiError(status, data)
 
-        return str(token)
+        try:
+            ttl = float(data.get("expires_in") or self._cfg.token_ttl_sec)
+        except (TypeError, ValueError):
+            ttl = self._cfg.token_ttl_sec
+        return SecretStr(token), time.time() + ttl
 
     def _request_json(
         self,
@@ -142,56 +437,107 @@ class WikiClient:
         token: Optional[str],
         json: Optional[Dict[str, Any]] = None,
         allow_auth_post: bool = False,
-        allow_write: bool = False
-    ) -> Dict[str, Any]:
+        allow_write: bool = False,
+        validators: Optional[Dict[str, str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Request JSON data from the API.
 
+        When validators is given, the request is made conditional and
+        validators is updated from the response.
+
         Returns:
-            Dict[str, Any]: A dictionary containing the JSON data.
+            Optional[Dict[str, Any]]: A dictionary containing the JSON data,
+                or None if the server replied 304 Not Modified.
         """
         self._guard(method, url, allow_auth_post, allow_write)
-        headers = {
-            "User-Agent": self.project_name,
-            "Accept": "application/json",
-        }
+        headers = {}
         if token:
             headers["Authorization"] = f"Bearer {token}"
-        resp = self._session.request(
-            method,
-            url,
-            headers=headers,
-            json=json,
-            timeout=self._cfg.timeout_sec,
-        )
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        resp = self._send(method, url, headers, json)
 
         # If token expired/invalid, refresh once and retry
         if resp.status_code in (401, 403) and token:
-            self._token = None
-            new_token = self._get_token()
+            new_token = self._refresh_token(token)
             headers["Authorization"] = f"Bearer {new_token}"
-            resp = self._session.request(
-                method,
-                url,
-                headers=headers,
-                json=json,
-                timeout=self._cfg.timeout_sec,
-            )
+            resp = self._send(method, url, headers, json)
+
+        if resp.status_code == 304 and validators:
+            return None
 
         if resp.status_code >= 400:
             body = (resp.text or "")[:300]
             raise ApiError(f"HTTP {resp.status_code}: {body}")
 
+        # Parse the raw bytes; json detects the UTF encoding itself, so
+        # requests' text decoding step is skipped. (The json parameter
+        # shadows the module here, hence the alias.)
         try:
-            data = resp.json()
-        except Exception as e:
+            data = _json_loads(resp.content)
+        except ValueError as e:
             raise ApiError(f"Invalid JSON: {e}") from e
 
         if not isinstance(data, dict):
             raise ApiError(f"Unexpected JSON type: {type(data).__name__}")
 
+        if validators is not None:
+            validators.clear()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if etag:
+                validators["etag"] = etag
+            if last_modified:
+                validators["last_modified"] = last_modified
+
         return data
 
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        json: Optional[Dict[str, Any]]
+    ) -> requests.Response:
+        """
+        Send a request, keeping track of consecutive failures.
+
+        Returns:
+            requests.Response: The response.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        if self.circuit_open:
+            raise CircuitOpenError(f"Circuit open, skipping request: {url}")
+        try:
+            resp = self._session.request(
+                method,
+                url,
+                headers=headers,
+                json=json,
+                timeout=self._cfg.timeout_sec,
+            )
+        except (requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError):
+            self._record_result(failed=True)
+            raise
+        self._record_result(failed=resp.status_code >= 500)
+        return resp
+
+    def _record_result(self, failed: bool) -> None:
+        with self._breaker_lock:
+            if not failed:
+                self._consecutive_failures = 0
+                return
+            self._consecutive_failures += 1
+            if self._consecutive_failures >= CIRCUIT_OPEN_THRESHOLD:
+                self._circuit_opened_at = time.monotonic()
+
     def _guard(
         self,
         method: str,
@@ -206,15 +552,14 @@ class WikiClient:
             ValueError: If the request is blocked.
         """
         method_upper = method.strip().upper()
-        if not url.startswith(self._cfg.base_url.rstrip("/") + "/"):
+        if not url.startswith(self._base_prefix):
             raise ValueError(f"Invalid URL: {url}")
 
         if method_upper == "GET":
             return
 
         if method_upper == "POST":
-            auth_suffix = f"{self._cfg.wiki_id}/auth"
-            if allow_auth_post and url.endswith(auth_suffix):
+            if allow_auth_post and url.endswith(self._auth_url_suffix):
                 return
             raise ValueError(f"Blocked method: {method}")
 
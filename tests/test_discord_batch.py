@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dreamwatcher.discord import _batch_messages, _rate_limit_wait
+
+
+def test_empty():
+    assert _batch_messages([]) == []
+
+
+def test_packs_within_limit():
+    got = _batch_messages(["a" * 5, "b" * 4, "c"], max_chars=10)
+    assert got == ["aaaaa\nbbbb", "c"], got
+
+
+def test_keeps_order():
+    msgs = [f"m{i}" for i in range(5)]
+    got = _batch_messages(msgs, max_chars=5)
+    assert "\n".join(got).split("\n") == msgs, got
+
+
+def test_oversized_message_sent_alone():
+    got = _batch_messages(["x" * 20, "y"], max_chars=10)
+    assert got == ["x" * 20, "y"], got
+
+
+def test_rate_limit_wait():
+    assert _rate_limit_wait({"X-RateLimit-Remaining": "3"}) == 0.0
+    exhausted = {
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset-After": "1.5",
+    }
+    assert _rate_limit_wait(exhausted) == 1.5
+    exhausted["X-RateLimit-Reset-After"] = "bogus"
+    assert _rate_limit_wait(exhausted) == 0.0
+
+
+if __name__ == "__main__":
+    test_empty()
+    test_packs_within_limit()
+    test_keeps_order()
+    test_oversized_message_sent_alone()
+    test_rate_limit_wait()
+    print("All checks passed.")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dreamwatcher import main as main_module
+from dreamwatcher.watcher import MAX_WORKERS, PAGE_FETCH_TIMEOUT_SEC
+
+REQUIRED_ENV = {
+    "WIKIWIKI_ID": "w",
+    "WIKIWIKI_URL_BASE": "https://wiki.invalid/",
+    "WIKIWIKI_API_KEY_ID": "k",
+    "WIKIWIKI_API_SECRET": "s",
+    "DISCORD_WEBHOOK_URL": "https://discord.invalid/hook",
+}
+CONCURRENCY_ENV = ("WIKIWIKI_MAX_WORKERS", "WIKIWIKI_PAGE_FETCH_TIMEOUT_SEC")
+
+
+def _main(**env):
+    """
+    Run main() with the required settings plus env, without a .env file.
+
+    Returns:
+        tuple: The exit code and the Config passed to run(), if any.
+    """
+    saved_env = dict(os.environ)
+    load_dotenv, run = main_module.load_dotenv, main_module.run
+    configs = []
+    for name in CONCURRENCY_ENV:
+        os.environ.pop(name, None)
+    os.environ.update(REQUIRED_ENV)
+    os.environ.update(env)
+    main_module.load_dotenv = lambda: None
+    main_module.run = lambda cfg: configs.append(cfg) or 0
+    try:
+        code = main_module.main()
+    finally:
+        main_module.load_dotenv, main_module.run = load_dotenv, run
+        os.environ.clear()
+        os.environ.update(saved_env)
+    return code, configs[0] if configs else None
+
+
+def test_concurrency_defaults():
+    code, cfg = _main()
+    assert code == 0
+    assert cfg.max_workers == MAX_WORKERS
+    assert cfg.page_fetch_timeout_sec == PAGE_FETCH_TIMEOUT_SEC
+
+
+def test_concurrency_settings_are_parsed():
+    code, cfg = _main(
+        WIKIWIKI_MAX_WORKERS=" 3 ", WIKIWIKI_PAGE_FETCH_TIMEOUT_SEC="2.5"
+    )
+    assert code == 0
+    assert cfg.max_workers == 3
+    assert cfg.page_fetch_timeout_sec == 2.5
+
+
+def test_invalid_max_workers_is_rejected():
+    for value in ("abc", "1.5", "0", "-1"):
+        code, cfg = _main(WIKIWIKI_MAX_WORKERS=value)
+        assert (code, cfg) == (2, None), value
+
+
+def test_invalid_page_fetch_timeout_is_rejected():
+    for value in ("x", "0", "-1"):
+        code, cfg = _main(WIKIWIKI_PAGE_FETCH_TIMEOUT_SEC=value)
+        assert (code, cfg) == (2, None), value
+
+
+if __name__ == "__main__":
+    test_concurrency_defaults()
+    test_concurrency_settings_are_parsed()
+    test_invalid_max_workers_is_rejected()
+    test_invalid_page_fetch_timeout_is_rejected()
+    print("All checks passed.")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dreamwatcher.snapshot import PageSnapshot, load_snapshots, save_snapshots
+
+
+def test_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "snapshots.json"
+        snapshots = {
+            "ページA": PageSnapshot(
+                "ページA", "本文\n2行目", "2024-01-01", "+x"
+            ),
+            "PageB": PageSnapshot("PageB", "body", "2024-01-02"),
+        }
+        save_snapshots(path, snapshots)
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["page_names"] == ["ページA", "PageB"], data
+        got = load_snapshots(path)
+        assert got == snapshots, got
+
+
+def test_load_legacy_layout():
+    legacy = {
+        "PageA": {
+            "page_name": "PageA",
+            "content": "old",
+            "timestamp": "2024-01-01",
+            "diff": "-a\n+b",
+        },
+        "PageB": {
+            "page_name": "PageB",
+            "content": "no diff key",
+            "timestamp": "2024-01-02",
+        },
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "snapshots.json"
+        path.write_text(json.dumps(legacy), encoding="utf-8")
+        got = load_snapshots(path)
+    assert got == {
+        "PageA": PageSnapshot("PageA", "old", "2024-01-01", "-a\n+b"),
+        "PageB": PageSnapshot("PageB", "no diff key", "2024-01-02"),
+    }, got
+
+
+def test_load_empty_bootstrap():
+    # The workflow seeds a missing snapshots file with "{}".
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "snapshots.json"
+        path.write_text("{}", encoding="utf-8")
+        assert load_snapshots(path) == {}
+
+
+def test_load_missing_file():
+    with tempfile.TemporaryDirectory() as tmp:
+        assert load_snapshots(Path(tmp) / "snapshots.json") == {}
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_load_legacy_layout()
+    test_load_empty_bootstrap()
+    test_load_missing_file()
+    print("All checks passed.")
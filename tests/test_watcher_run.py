@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dreamwatcher import watcher
+from dreamwatcher.state import State, load_state
+from dreamwatcher.wiki import ApiError, CircuitOpenError
+
+
+class FakeWiki:
+    """In-memory stand-in for WikiClient."""
+    def __init__(self, pages: dict, failing: set, etags: dict = None):
+        self.pages = pages
+        self.failing = failing
+        self.etags = etags or {}
+        self.sent_validators = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def get_page(self, page_name):
+        if page_name in self.failing:
+            raise ApiError("HTTP 503: unavailable")
+        source, timestamp = self.pages[page_name]
+        return {"page": page_name, "source": source, "timestamp": timestamp}
+
+    def get_page_if_modified(self, page_name, validators):
+        self.sent_validators.append((page_name, dict(validators)))
+        etag = self.etags.get(page_name)
+        if etag and validators.get("etag") == etag:
+            return None
+        validators.clear()
+        if etag:
+            validators["etag"] = etag
+        return self.get_page(page_name)
+
+
+class FakeWebhook:
+    sent: list = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def send_events(self, events, header=None):
+        FakeWebhook.sent.extend(event.title for event in events)
+        return []
+
+
+def _run(cfg, pages, failing=frozenset(), etags=None):
+    create_wiki_client = watcher.create_wiki_client
+    webhook_client = watcher.WebhookClient
+    watcher.create_wiki_client = (
+        lambda cfg: FakeWiki(pages, set(failing), etags)
+    )
+    watcher.WebhookClient = FakeWebhook
+    FakeWebhook.sent = []
+    try:
+        return watcher.run(cfg)
+    finally:
+        watcher.create_wiki_client = create_wiki_client
+        watcher.WebhookClient = webhook_client
+
+
+def _config(tmp_path: Path) -> watcher.Config:
+    return watcher.Config(
+        wiki_id="w", api_key_id="k", api_secret="s",
+        discord_webhook_url="https://discord.invalid/hook",
+        state_path=tmp_path / "state.json",
+        page_names=["P"], wiki_url="https://wiki.invalid/w/",
+        snapshots_dir=tmp_path / ".snapshots",
+        monitor_recent_created=False
+    )
+
+
+def test_failed_page_fetch_does_not_advance_state():
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = _config(Path(tmp))
+        pages = {
+            "RecentChanges": ("- [[P]]\n", "2025-01-01T00:00:00+09:00"),
+            "P": ("* P\n- first\n", "2025-01-01T00:00:00+09:00"),
+        }
+        assert _run(cfg, pages) == 0
+
+        state_before = cfg.state_path.read_bytes()
+        snapshots_path = cfg.snapshots_dir / "snapshots.json"
+        snapshots_before = snapshots_path.read_bytes()
+
+        pages["RecentChanges"] = (
+            "- [[P]] 01-02\n- [[P]]\n", "2025-01-02T00:00:00+09:00"
+        )
+        pages["P"] = ("* P\n- first\n- second\n", "2025-01-02T00:00:00+09:00")
+        try:
+            _run(cfg, pages, failing={"P"})
+        except ApiError:
+            pass
+        else:
+            raise AssertionError("run() should abort on ApiError")
+        assert cfg.state_path.read_bytes() == state_before
+        assert snapshots_path.read_bytes() == snapshots_before
+        assert FakeWebhook.sent == [], FakeWebhook.sent
+
+        assert _run(cfg, pages) == 0
+        # The update missed by the failed run is reported now.
+        sent = FakeWebhook.sent
+        assert any("【P】 が更新されました" in t for t in sent), sent
+
+
+def test_circuit_open_error_is_not_an_os_error():
+    # The watcher skips pages on OSError; an open circuit must end the run.
+    assert issubclass(CircuitOpenError, ApiError)
+    assert not issubclass(CircuitOpenError, OSError)
+
+
+def test_not_modified_page_is_unchanged():
+    state = State(seen={}, updated_at=None, content_hashes={"content_P": "h"})
+    state.http_validators["P"] = {"etag": "e1"}
+    client = FakeWiki({"P": ("body", "t")}, set(), etags={"P": "e1"})
+    result = watcher._fetch_page("P", client, state, {}, {})
+    assert not result.has_changed and not result.is_initial
+    assert result.snapshot is None
+    assert client.sent_validators == [("P", {"etag": "e1"})]
+    assert state.content_hashes == {"content_P": "h"}
+    assert state.http_validators == {"P": {"etag": "e1"}}
+
+
+def test_validators_cleared_when_response_has_none():
+    state = State(seen={}, updated_at=None, content_hashes={"content_P": "h"})
+    state.http_validators["P"] = {"etag": "stale"}
+    client = FakeWiki({"P": ("body", "t")}, set())
+    result = watcher._fetch_page("P", client, state, {}, {})
+    assert result.has_changed
+    assert "P" not in state.http_validators, state.http_validators
+
+
+def test_validators_sent_only_with_stored_hash():
+    state = State(seen={}, updated_at=None, content_hashes={})
+    state.http_validators["P"] = {"etag": "e1"}
+    assert watcher._page_validators("P", state) == {}
+    state.content_hashes["content_P"] = "h"
+    validators = watcher._page_validators("P", state)
+    assert validators == {"etag": "e1"}
+    assert validators is not state.http_validators["P"]
+
+
+def test_quiet_run_saves_new_validators():
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = _config(Path(tmp))
+        pages = {
+            "RecentChanges": ("- [[P]]\n", "2025-01-01T00:00:00+09:00"),
+            "P": ("* P\n- first\n", "2025-01-01T00:00:00+09:00"),
+        }
+        assert _run(cfg, pages) == 0
+        assert load_state(cfg.state_path).http_validators == {}
+
+        # Nothing changed, but the server now hands out an ETag.
+        assert _run(cfg, pages, etags={"RecentChanges": "e1"}) == 0
+        assert FakeWebhook.sent == [], FakeWebhook.sent
+        validators = load_state(cfg.state_path).http_validators
+        assert validators == {"RecentChanges": {"etag": "e1"}}, validators
+
+
+if __name__ == "__main__":
+    test_failed_page_fetch_does_not_advance_state()
+    test_circuit_open_error_is_not_an_os_error()
+    test_not_modified_page_is_unchanged()
+    test_validators_cleared_when_response_has_none()
+    test_validators_sent_only_with_stored_hash()
+    test_quiet_run_saves_new_validators()
+    print("All checks passed.")
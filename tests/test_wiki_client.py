@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dreamwatcher import wiki
+from dreamwatcher.wiki import (
+    ApiError, CircuitOpenError, WikiApiConfig, WikiAuth, WikiClient
+)
+
+URL = "https://api.wikiwiki.jp/w/page/P"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=b'{"source": "s"}', headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.text = body.decode("utf-8")
+        self.headers = headers or {}
+
+
+class FakeSession:
+    """Replays queued responses and records the requests made."""
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, headers=None, json=None, timeout=None):
+        self.requests.append((method, url, dict(headers or {})))
+        return self.responses.pop(0)
+
+
+def make_client(responses=(), **cfg_kwargs) -> WikiClient:
+    cfg_kwargs.setdefault("token_cache", False)
+    client = WikiClient(WikiApiConfig(wiki_id="w", **cfg_kwargs),
+                        WikiAuth("key", "secret"))
+    client._session = FakeSession(responses)
+    return client
+
+
+def _expect(exc_type, func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except exc_type as e:
+        return e
+    raise AssertionError(f"{exc_type.__name__} not raised")
+
+
+def test_server_error_is_api_error_not_os_error():
+    client = make_client([FakeResponse(503, b"down")])
+    e = _expect(ApiError, client._request_json, "GET", URL, token=None)
+    assert not isinstance(e, OSError), type(e)
+
+
+def test_circuit_opens_after_consecutive_failures():
+    threshold = wiki.CIRCUIT_OPEN_THRESHOLD
+    client = make_client([FakeResponse(503, b"down")] * threshold)
+    for _ in range(threshold):
+        _expect(ApiError, client._request_json, "GET", URL, token=None)
+    assert client.circuit_open
+    _expect(CircuitOpenError, client._request_json, "GET", URL, token=None)
+    assert len(client._session.requests) == threshold
+
+
+def test_half_open_after_cooldown():
+    threshold = wiki.CIRCUIT_OPEN_THRESHOLD
+    client = make_client([FakeResponse(503, b"down")] * (threshold + 1))
+    for _ in range(threshold):
+        _expect(ApiError, client._request_json, "GET", URL, token=None)
+
+    # Once the cooldown has passed a trial request goes out; a failure
+    # opens the circuit again straight away.
+    client._circuit_opened_at -= wiki.CIRCUIT_OPEN_SEC
+    assert not client.circuit_open
+    _expect(ApiError, client._request_json, "GET", URL, token=None)
+    assert client.circuit_open
+
+    # A successful trial closes it.
+    client._circuit_opened_at -= wiki.CIRCUIT_OPEN_SEC
+    client._session.responses.append(FakeResponse())
+    assert client._request_json("GET", URL, token=None) == {"source": "s"}
+    assert not client.circuit_open
+    assert client._consecutive_failures == 0
+
+
+def test_conditional_get_not_modified():
+    client = make_client([FakeResponse(304, b"")])
+    validators = {"etag": '"v1"', "last_modified": "Wed, 01 Jan 2025"}
+    got = client._request_json("GET", URL, token="t", validators=validators)
+    assert got is None
+    headers = client._session.requests[0][2]
+    assert headers["If-None-Match"] == '"v1"', headers
+    assert headers["If-Modified-Since"] == "Wed, 01 Jan 2025", headers
+    assert validators == {"etag": '"v1"', "last_modified": "Wed, 01 Jan 2025"}
+
+
+def test_conditional_get_updates_and_clears_validators():
+    client = make_client([
+        FakeResponse(headers={"ETag": '"v2"'}),
+        FakeResponse(),
+    ])
+    validators = {"etag": '"v1"', "last_modified": "Wed, 01 Jan 2025"}
+    client._request_json("GET", URL, token="t", validators=validators)
+    assert validators == {"etag": '"v2"'}, validators
+    client._request_json("GET", URL, token="t", validators=validators)
+    assert validators == {}, validators
+
+
+def test_unconditional_get_sends_no_validators():
+    client = make_client([FakeResponse()])
+    client._request_json("GET", URL, token="t", validators={})
+    headers = client._session.requests[0][2]
+    assert "If-None-Match" not in headers, headers
+    assert "If-Modified-Since" not in headers, headers
+
+
+def _authenticated(client: WikiClient) -> WikiClient:
+    client._token = "t"
+    client._token_exp = time.time() + 3600
+    return client
+
+
+def test_concurrent_get_page_shares_one_request():
+    release = threading.Event()
+
+    class SlowSession(FakeSession):
+        def request(self, *args, **kwargs):
+            release.wait(5)
+            return super().request(*args, **kwargs)
+
+    client = _authenticated(make_client())
+    client._session = SlowSession([FakeResponse()])
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(client.get_page("P")))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == [{"source": "s"}] * 2, results
+    assert len(client._session.requests) == 1, client._session.requests
+
+
+def test_get_page_error_is_not_cached():
+    client = _authenticated(make_client([
+        FakeResponse(404, b"missing"),
+        FakeResponse(),
+    ]))
+    _expect(ApiError, client.get_page, "P")
+    assert client.get_page("P") == {"source": "s"}
+    assert client.get_page("P") == {"source": "s"}
+    assert len(client._session.requests) == 2, client._session.requests
+
+
+class CacheHome:
+    """Point XDG_CACHE_HOME at a temporary directory."""
+    def __enter__(self) -> Path:
+        self._tmp = tempfile.TemporaryDirectory()
+        self._old = os.environ.get("XDG_CACHE_HOME")
+        os.environ["XDG_CACHE_HOME"] = self._tmp.name
+        return Path(self._tmp.name)
+
+    def __exit__(self, *exc_info):
+        if self._old is None:
+            os.environ.pop("XDG_CACHE_HOME", None)
+        else:
+            os.environ["XDG_CACHE_HOME"] = self._old
+        self._tmp.cleanup()
+
+
+def test_token_cache_file_is_private():
+    with CacheHome():
+        client = make_client(token_cache=True)
+        client._save_cached_token("tok", time.time() + 3600)
+        path = client._token_path
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert stat.S_IMODE(path.parent.stat().st_mode) == 0o700
+        assert make_client(token_cache=True)._load_cached_token()[0] == "tok"
+
+
+def test_token_cache_refuses_unsafe_files():
+    with CacheHome() as cache_home:
+        client = make_client(token_cache=True)
+        client._save_cached_token("tok", time.time() + 3600)
+        path = client._token_path
+
+        path.chmod(0o640)
+        assert client._load_cached_token() is None
+        path.chmod(0o604)
+        assert client._load_cached_token() is None
+
+        target = cache_home / "elsewhere.json"
+        target.write_text(
+            json.dumps({"token": "evil", "exp": time.time() + 3600})
+        )
+        target.chmod(0o600)
+        path.unlink()
+        path.symlink_to(target)
+        assert client._load_cached_token() is None
+        client._save_cached_token("tok2", time.time() + 3600)
+        assert not path.is_symlink()
+        assert "evil" in target.read_text()
+
+
+def test_is_private_file_checks_owner():
+    def fake_stat(mode, uid):
+        return os.stat_result((mode, 0, 0, 1, uid, 0, 0, 0, 0, 0))
+
+    me = os.getuid()
+    assert wiki._is_private_file(fake_stat(stat.S_IFREG | 0o600, me))
+    assert not wiki._is_private_file(fake_stat(stat.S_IFREG | 0o600, me + 1))
+    assert not wiki._is_private_file(fake_stat(stat.S_IFREG | 0o660, me))
+    assert not wiki._is_private_file(fake_stat(stat.S_IFDIR | 0o700, me))
+
+
+def test_token_cache_expiry_margin():
+    margin = wiki.TOKEN_REFRESH_MARGIN_SEC
+    with CacheHome():
+        client = make_client(token_cache=True)
+        client._save_cached_token("soon", time.time() + margin - 5)
+        assert client._load_cached_token() is None
+        client._save_cached_token("later", time.time() + margin + 60)
+        assert client._load_cached_token()[0] == "later"
+
+
+def test_token_cache_dropped_after_401():
+    with CacheHome():
+        client = make_client([
+            FakeResponse(401, b"expired"),
+            FakeResponse(body=b'{"token": "new", "expires_in": 3600}'),
+            FakeResponse(),
+        ], token_cache=True)
+        client._save_cached_token("old", time.time() + 3600)
+        assert client.get_page("P") == {"source": "s"}
+        methods = [method for method, _, _ in client._session.requests]
+        assert methods == ["GET", "POST", "GET"], methods
+        auth = client._session.requests[2][2]["Authorization"]
+        assert auth == "Bearer new", auth
+        cached = json.loads(client._token_path.read_text())
+        assert cached["token"] == "new", cached
+
+
+def test_token_cache_disabled_touches_nothing():
+    def no_home(*args):
+        raise RuntimeError("no home directory")
+
+    token_cache_path = wiki._token_cache_path
+    wiki._token_cache_path = no_home
+    try:
+        client = make_client(token_cache=False)
+    finally:
+        wiki._token_cache_path = token_cache_path
+    assert client._token_path is None
+    assert client._load_cached_token() is None
+    client._save_cached_token("tok", time.time() + 3600)
+    client._drop_cached_token()
+
+
+if __name__ == "__main__":
+    test_server_error_is_api_error_not_os_error()
+    test_circuit_opens_after_consecutive_failures()
+    test_half_open_after_cooldown()
+    test_conditional_get_not_modified()
+    test_conditional_get_updates_and_clears_validators()
+    test_unconditional_get_sends_no_validators()
+    test_concurrent_get_page_shares_one_request()
+    test_get_page_error_is_not_cached()
+    test_token_cache_file_is_private()
+    test_token_cache_refuses_unsafe_files()
+    test_is_private_file_checks_owner()
+    test_token_cache_expiry_margin()
+    test_token_cache_dropped_after_401()
+    test_token_cache_disabled_touches_nothing()
+    print("All checks passed.")